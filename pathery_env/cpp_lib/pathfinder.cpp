@@ -88,6 +88,124 @@ std::vector<Position> Pathfinder::calculateShortestPath() const {
   return overallPath;
 }
 
+void Pathfinder::calculateRelevantCells(int32_t *output) const {
+  const int cellCount = gridHeight_ * gridWidth_;
+  const int checkpointStartValue = static_cast<int>(CellType::kLength);
+  const int teleporterStartValue = checkpointStartValue + checkpointCount_;
+
+  auto isPassable = [&](int pos) {
+    return grid_[pos] != static_cast<int>(CellType::kRock) && grid_[pos] != static_cast<int>(CellType::kWall);
+  };
+  auto isTerminal = [&](int pos) {
+    return grid_[pos] == static_cast<int>(CellType::kStart) || grid_[pos] == static_cast<int>(CellType::kGoal) || grid_[pos] >= checkpointStartValue;
+  };
+  auto isSource = [&](int pos) {
+    // Somewhere that a path can start from
+    return grid_[pos] == static_cast<int>(CellType::kStart) || grid_[pos] >= teleporterStartValue;
+  };
+  auto isDestination = [&](int pos) {
+    // Somewhere that a path can go to
+    return grid_[pos] == static_cast<int>(CellType::kGoal) || grid_[pos] >= checkpointStartValue;
+  };
+  auto neighbor = [&](int pos, int direction) {
+    // Up, right, down, left. Returns -1 if off the grid.
+    const int row = pos / gridWidth_;
+    const int col = pos % gridWidth_;
+    if (direction == 0) {
+      return row > 0 ? pos-gridWidth_ : -1;
+    } else if (direction == 1) {
+      return col < gridWidth_-1 ? pos+1 : -1;
+    } else if (direction == 2) {
+      return row < gridHeight_-1 ? pos+gridWidth_ : -1;
+    }
+    return col > 0 ? pos-1 : -1;
+  };
+
+  // Iterative Tarjan's articulation point search over the passable cells
+  struct Frame {
+    int pos;
+    int nextDirection;
+  };
+  std::vector<int> discovery(cellCount, -1);
+  std::vector<int> low(cellCount, 0);
+  std::vector<int> parent(cellCount, -1);
+  std::vector<char> subtreeHasTerminal(cellCount, false);
+  std::vector<char> isPocketRoot(cellCount, false);
+  std::vector<char> inPocket(cellCount, false);
+  std::vector<Frame> stack;
+  std::vector<int> component;
+  int time = 0;
+  std::fill(output, output+cellCount, 0);
+
+  for (int root=0; root<cellCount; ++root) {
+    // Root each search at a terminal. This guarantees that whatever is left after cutting off a subtree contains a terminal.
+    if (discovery[root] != -1 || !isTerminal(root)) {
+      continue;
+    }
+    discovery[root] = low[root] = time++;
+    subtreeHasTerminal[root] = true;
+    component.clear();
+    component.push_back(root);
+    stack.push_back({root, 0});
+    while (!stack.empty()) {
+      const int current = stack.back().pos;
+      bool descended = false;
+      while (stack.back().nextDirection < 4) {
+        const int next = neighbor(current, stack.back().nextDirection++);
+        if (next == -1 || !isPassable(next)) {
+          continue;
+        }
+        if (discovery[next] == -1) {
+          // Tree edge, descend
+          parent[next] = current;
+          discovery[next] = low[next] = time++;
+          subtreeHasTerminal[next] = isTerminal(next);
+          component.push_back(next);
+          stack.push_back({next, 0});
+          descended = true;
+          break;
+        } else if (next != parent[current]) {
+          // Back edge
+          low[current] = std::min(low[current], discovery[next]);
+        }
+      }
+      if (descended) {
+        continue;
+      }
+      // Finished exploring everything below current
+      stack.pop_back();
+      if (stack.empty()) {
+        continue;
+      }
+      const int currentParent = stack.back().pos;
+      low[currentParent] = std::min(low[currentParent], low[current]);
+      subtreeHasTerminal[currentParent] = subtreeHasTerminal[currentParent] || subtreeHasTerminal[current];
+      if (low[current] >= discovery[currentParent] && !subtreeHasTerminal[current]) {
+        // The subtree below current can only be reached through currentParent and holds nothing worth pathing to.
+        // If currentParent is ice, a path sliding across it might be forced into the pocket, so we must keep it.
+        if (grid_[currentParent] != static_cast<int>(CellType::kIce)) {
+          isPocketRoot[current] = true;
+        }
+      }
+    }
+
+    // A component is only relevant if a path can both enter it and go somewhere within it
+    const bool hasSource = std::any_of(component.begin(), component.end(), isSource);
+    const bool hasDestination = std::any_of(component.begin(), component.end(), isDestination);
+    if (!hasSource || !hasDestination) {
+      continue;
+    }
+    // The component is in discovery order, so parents are always handled before their children
+    for (const int pos : component) {
+      if (isPocketRoot[pos] || (parent[pos] != -1 && inPocket[parent[pos]])) {
+        inPocket[pos] = true;
+      } else {
+        output[pos] = 1;
+      }
+    }
+  }
+}
+
 void Pathfinder::adjustPathForTeleporters(const int destinationType, std::set<int> &usedTeleporters, std::vector<Position> &path) const {
   // Takes a path and checks if it goes into any of the active teleporters. If it does, the path will be updated to go through the teleporter and find the new shortest path to the same destination type (maybe a different instance of the destination perviously found).
   // Does this path hit a teleporter?
@@ -40,6 +40,8 @@ class Pathfinder {
 public:
   Pathfinder(const int32_t *grid, int32_t height, int32_t width, int32_t checkpointCount, int32_t teleporterCount);
   std::vector<Position> calculateShortestPath() const;
+  // Writes 1 into `output` for every cell which could be on a shortest path and 0 for every other cell. Irrelevant cells are either not connected to a start/teleporter or are inside a dead-end pocket (a region only reachable through a single cell, which holds no start, goal, checkpoint, or teleporter).
+  void calculateRelevantCells(int32_t *output) const;
 
 private:
   using TeleporterIndexType = int;
@@ -28,4 +28,17 @@ void getShortestPath(const int32_t *grid, int32_t height, int32_t width, int32_t
   }
 }
 
+void getShortestPathLengths(const int32_t *grids, int32_t gridCount, int32_t height, int32_t width, int32_t checkpointCount, int32_t teleporterCount, int32_t *output) {
+  const int32_t gridSize = height * width;
+  for (int32_t i=0; i<gridCount; ++i) {
+    Pathfinder pathfinder(grids + i*gridSize, height, width, checkpointCount, teleporterCount);
+    output[i] = pathfinder.calculateShortestPath().size();
+  }
+}
+
+void getRelevantCells(const int32_t *grid, int32_t height, int32_t width, int32_t checkpointCount, int32_t teleporterCount, int32_t *output) {
+  Pathfinder pathfinder(grid, height, width, checkpointCount, teleporterCount);
+  pathfinder.calculateRelevantCells(output);
+}
+
 }
\ No newline at end of file
@@ -9,6 +9,12 @@ extern "C" {
 
 void getShortestPath(const int32_t *grid, int32_t height, int32_t width, int32_t checkpointCount, int32_t teleporterCount, int32_t *output, int32_t outputBufferSize);
 
+// Calculates the shortest path length for each of `gridCount` grids, which are stored back to back in `grids`. A length of 0 means that the path is blocked.
+void getShortestPathLengths(const int32_t *grids, int32_t gridCount, int32_t height, int32_t width, int32_t checkpointCount, int32_t teleporterCount, int32_t *output);
+
+// Writes 1 into `output` (height*width values) for every cell which could be on a shortest path and 0 for every other cell.
+void getRelevantCells(const int32_t *grid, int32_t height, int32_t width, int32_t checkpointCount, int32_t teleporterCount, int32_t *output);
+
 #ifdef __cplusplus
 }
 #endif
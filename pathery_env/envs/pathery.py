@@ -199,6 +199,44 @@ class PatheryEnv(gym.Env):
     ans+="."
     return ans
 
+  def getShortestPathLengths(self, grids):
+    """Calculates the shortest path length for each grid in `grids`, an array of shape (N, height, width). This board's starts, goals, checkpoints, and teleporters are assumed. A length of 0 means that the path is blocked."""
+    grids = np.ascontiguousarray(grids, dtype=np.int32)
+    pathLengths = np.empty(len(grids), dtype=np.int32)
+    if self.hasCppShortestPathLengths:
+      # Evaluate the whole batch with a single call into C++
+      self.pathfindingLibrary.getShortestPathLengths(grids, len(grids), self.gridSize[0], self.gridSize[1], self.maxCheckpointCount, len(self.teleporters), pathLengths)
+      return pathLengths
+
+    for i, grid in enumerate(grids):
+      pathLengths[i] = len(self.getShortestPath(grid))
+    return pathLengths
+
+  def getShortestPath(self, grid=None):
+    """Returns the shortest path through `grid` (defaults to the current grid) as a list of (row, col). This board's starts, goals, checkpoints, and teleporters are assumed. An empty list means that the path is blocked."""
+    if grid is None:
+      path = self._calculateShortestPath()
+    else:
+      # Pathfinding works directly on self.grid, so temporarily swap in the given grid
+      originalGrid = self.grid
+      try:
+        self.grid = np.ascontiguousarray(grid, dtype=np.int32)
+        path = self._calculateShortestPath()
+      finally:
+        self.grid = originalGrid
+    return [(int(row), int(col)) for row, col in path]
+
+  def getRelevantCells(self):
+    """Returns a boolean array of the grid's shape which is True for every cell which could be on a shortest path, now or after placing more walls.
+
+    Irrelevant cells are either not connected to any start/teleporter, or are inside of a dead-end pocket. A pocket is a region which is only connected to the rest of the board through a single cell and which contains no start, goal, checkpoint, or teleporter. A path would need to enter and leave a pocket through the same cell, which a shortest path never does.
+    """
+    if self.hasCppRelevantCells:
+      relevantCells = np.empty(self.gridSize, dtype=np.int32)
+      self.pathfindingLibrary.getRelevantCells(self.grid, self.gridSize[0], self.gridSize[1], self.maxCheckpointCount, len(self.teleporters), relevantCells)
+      return relevantCells.astype(bool)
+    return self._calculateRelevantCellsPython()
+
   # =========================================================================================
   # ================================ Private functions below ================================
   # =========================================================================================
@@ -223,6 +261,36 @@ class PatheryEnv(gym.Env):
       self.pathfindingLibrary = None
       print(f'Failed to load C++ pathfinding library: "{e}". Using python pathfinding.')
 
+    # Optional functions; if the library was built before these existed, only these fall back to python
+    self.hasCppShortestPathLengths = self._tryRegisteringCppFunction('getShortestPathLengths', [
+      np.ctypeslib.ndpointer(ctypes.c_int32, flags="C_CONTIGUOUS"),
+      ctypes.c_int32,
+      ctypes.c_int32,
+      ctypes.c_int32,
+      ctypes.c_int32,
+      ctypes.c_int32,
+      np.ctypeslib.ndpointer(ctypes.c_int32, flags="C_CONTIGUOUS")
+    ])
+    self.hasCppRelevantCells = self._tryRegisteringCppFunction('getRelevantCells', [
+      np.ctypeslib.ndpointer(ctypes.c_int32, flags="C_CONTIGUOUS"),
+      ctypes.c_int32,
+      ctypes.c_int32,
+      ctypes.c_int32,
+      ctypes.c_int32,
+      np.ctypeslib.ndpointer(ctypes.c_int32, flags="C_CONTIGUOUS")
+    ])
+
+  def _tryRegisteringCppFunction(self, name, argtypes):
+    """Sets the argtypes of an optional C++ library function. Returns whether the function is available."""
+    if self.pathfindingLibrary is None:
+      return False
+    try:
+      getattr(self.pathfindingLibrary, name).argtypes = argtypes
+      return True
+    except AttributeError:
+      print(f'C++ pathfinding library has no "{name}", it may need to be rebuilt. Using python for {name}.')
+      return False
+
   def _linearTo2d(self, pos):
     return pos//self.gridSize[1], pos%self.gridSize[1]
 
@@ -489,6 +557,102 @@ class PatheryEnv(gym.Env):
 
     return overallPath
 
+  def _calculateRelevantCellsPython(self):
+    # Mirrors Pathfinder::calculateRelevantCells in the C++ library
+    height, width = self.gridSize
+    grid = self.grid.ravel().tolist()
+    cellCount = height*width
+    teleporterStartValue = len(CellType) + self.maxCheckpointCount
+
+    def isPassable(value):
+      return value != CellType.ROCK.value and value != CellType.WALL.value
+
+    def isTerminal(value):
+      return value == CellType.START.value or value == CellType.GOAL.value or value >= len(CellType)
+
+    def isSource(value):
+      # Somewhere that a path can start from
+      return value == CellType.START.value or value >= teleporterStartValue
+
+    def isDestination(value):
+      # Somewhere that a path can go to
+      return value == CellType.GOAL.value or value >= len(CellType)
+
+    def neighbors(pos):
+      row, col = divmod(pos, width)
+      # Up, right, down, left
+      if row > 0:
+        yield pos-width
+      if col < width-1:
+        yield pos+1
+      if row < height-1:
+        yield pos+width
+      if col > 0:
+        yield pos-1
+
+    # Iterative Tarjan's articulation point search over the passable cells
+    discovery = [-1] * cellCount
+    low = [0] * cellCount
+    parent = [-1] * cellCount
+    subtreeHasTerminal = [False] * cellCount
+    pocketRoots = set()
+    relevant = [False] * cellCount
+    time = 0
+
+    for root in range(cellCount):
+      # Root each search at a terminal. This guarantees that whatever is left after cutting off a subtree contains a terminal.
+      if discovery[root] != -1 or not isTerminal(grid[root]):
+        continue
+      discovery[root] = low[root] = time
+      time += 1
+      subtreeHasTerminal[root] = True
+      component = [root]
+      stack = [(root, neighbors(root))]
+      while stack:
+        current, neighborIterator = stack[-1]
+        for neighbor in neighborIterator:
+          if not isPassable(grid[neighbor]):
+            continue
+          if discovery[neighbor] == -1:
+            # Tree edge, descend
+            parent[neighbor] = current
+            discovery[neighbor] = low[neighbor] = time
+            time += 1
+            subtreeHasTerminal[neighbor] = isTerminal(grid[neighbor])
+            component.append(neighbor)
+            stack.append((neighbor, neighbors(neighbor)))
+            break
+          elif neighbor != parent[current]:
+            # Back edge
+            low[current] = min(low[current], discovery[neighbor])
+        else:
+          # Finished exploring everything below current
+          stack.pop()
+          if not stack:
+            continue
+          currentParent = stack[-1][0]
+          low[currentParent] = min(low[currentParent], low[current])
+          subtreeHasTerminal[currentParent] = subtreeHasTerminal[currentParent] or subtreeHasTerminal[current]
+          if low[current] >= discovery[currentParent] and not subtreeHasTerminal[current]:
+            # The subtree below current can only be reached through currentParent and holds nothing worth pathing to.
+            # If currentParent is ice, a path sliding across it might be forced into the pocket, so we must keep it.
+            if grid[currentParent] != CellType.ICE.value:
+              pocketRoots.add(current)
+
+      # A component is only relevant if a path can both enter it and go somewhere within it
+      componentValues = [grid[pos] for pos in component]
+      if not (any(isSource(value) for value in componentValues) and any(isDestination(value) for value in componentValues)):
+        continue
+      # The component list is in discovery order, so parents are always handled before their children
+      inPocket = set()
+      for pos in component:
+        if pos in pocketRoots or parent[pos] in inPocket:
+          inPocket.add(pos)
+        else:
+          relevant[pos] = True
+
+    return np.array(relevant, dtype=bool).reshape(self.gridSize)
+
   def _calculateShortestPathCpp(self):
     # Need to give C++:
     #   The grid
@@ -503,7 +667,7 @@ class PatheryEnv(gym.Env):
     outputBufferLength = np.prod(self.gridSize)*2*10+1
     shortestPathOutputBuffer = np.empty(outputBufferLength, dtype=np.int32)
 
-    # Call the C++ function
+    # Call the C++ function. ctypes releases the GIL for the duration of the call, and the C++ side only reads the grid and writes to our own output buffer, so envs can safely pathfind concurrently from different threads.
     self.pathfindingLibrary.getShortestPath(self.grid, self.gridSize[0], self.gridSize[1], self.maxCheckpointCount, len(self.teleporters), shortestPathOutputBuffer, outputBufferLength)
 
     # Transform and return the path
@@ -0,0 +1,2 @@
+from pathery_env.remote.client import PatheryEnvClient
+from pathery_env.remote.server import PatheryEnvServer
\ No newline at end of file
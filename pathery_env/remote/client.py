@@ -0,0 +1,120 @@
+import socket
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+
+from pathery_env.envs.pathery import PatheryEnv
+from pathery_env.remote import protocol
+
+class PatheryEnvClient(gym.vector.VectorEnv):
+  """A vector env whose boards are hosted by a PatheryEnvServer.
+
+  The client does not need the C++ pathfinding library. Like gymnasium's other vector envs, an env which finishes is automatically reset on the following step.
+    address: Either a (host, port) tuple for TCP or a path to a Unix socket.
+    map_string: The map to play. If None, random normal maps are used.
+  """
+
+  metadata = {"autoreset_mode": gym.vector.AutoresetMode.NEXT_STEP}
+
+  def __init__(self, address, num_envs, map_string=None):
+    if isinstance(address, str):
+      self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    else:
+      self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+      self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    self.socket.connect(address)
+
+    payload = protocol.MAKE_REQUEST.pack(num_envs) + (map_string or '').encode()
+    response = self._request(protocol.MESSAGE_MAKE, payload)
+    self.num_envs, self.cellTypeCount, height, width = protocol.MAKE_RESPONSE.unpack(response)
+    self.gridSize = (height, width)
+
+    self.single_observation_space = spaces.Dict()
+    self.single_observation_space[PatheryEnv.OBSERVATION_BOARD_STR] = spaces.Box(low=0.0, high=1.0, shape=(self.cellTypeCount, height, width))
+    self.single_action_space = spaces.MultiDiscrete((height, width))
+    self.observation_space = gym.vector.utils.batch_space(self.single_observation_space, self.num_envs)
+    self.action_space = gym.vector.utils.batch_space(self.single_action_space, self.num_envs)
+
+    # Used to expand grids into one-hot observations, matching PatheryEnv._get_obs
+    self.cellTypeValues = np.arange(self.cellTypeCount).reshape(1, self.cellTypeCount, 1, 1)
+
+  def reset(self, *, seed=None, options=None):
+    """Resets the envs. Like gymnasium's SyncVectorEnv, `seed` may be None, an int (env i is seeded with seed+i), or a list with a seed per env, and `options` may contain a 'reset_mask' to only reset some of the envs."""
+    if seed is None:
+      seeds = [None] * self.num_envs
+    elif isinstance(seed, int):
+      seeds = [seed + i for i in range(self.num_envs)]
+    else:
+      seeds = list(seed)
+      if len(seeds) != self.num_envs:
+        raise ValueError(f'If seeds are passed as a list the length must match num_envs={self.num_envs} but got length={len(seeds)}.')
+    # Only an int seed also seeds this vector env itself
+    super().reset(seed=(seed if isinstance(seed, int) else None))
+
+    options = dict(options or {})
+    resetMask = options.pop('reset_mask', None)
+    if options:
+      raise NotImplementedError(f'The env server only supports the "reset_mask" option, got {list(options)}')
+    if resetMask is None:
+      resetMask = np.ones(self.num_envs, dtype=bool)
+    elif not isinstance(resetMask, np.ndarray) or resetMask.dtype != np.bool_ or resetMask.shape != (self.num_envs,):
+      raise ValueError(f'`options["reset_mask"]` must be a boolean numpy array of shape ({self.num_envs},)')
+    elif not np.any(resetMask):
+      raise ValueError('`options["reset_mask"]` must contain at least one True value')
+
+    seedArray = np.array([protocol.NO_SEED if s is None else s for s in seeds], dtype='<i8')
+    response = self._request(protocol.MESSAGE_RESET, seedArray.tobytes() + resetMask.astype(np.uint8).tobytes())
+    grids, offset = self._unpackGrids(response)
+    pathLengths = np.frombuffer(response, dtype=np.int32, count=self.num_envs, offset=offset)
+    return self._get_obs(grids), self._get_info(pathLengths, resetMask)
+
+  def step(self, actions):
+    actions = np.ascontiguousarray(actions, dtype=np.int32).reshape(self.num_envs, 2)
+    response = self._request(protocol.MESSAGE_STEP, actions.tobytes())
+    grids, offset = self._unpackGrids(response)
+    rewards = np.frombuffer(response, dtype=np.int32, count=self.num_envs, offset=offset)
+    offset += rewards.nbytes
+    terminated = np.frombuffer(response, dtype=np.uint8, count=self.num_envs, offset=offset).astype(bool)
+    offset += self.num_envs
+    truncated = np.frombuffer(response, dtype=np.uint8, count=self.num_envs, offset=offset).astype(bool)
+    offset += self.num_envs
+    pathLengths = np.frombuffer(response, dtype=np.int32, count=self.num_envs, offset=offset)
+    return self._get_obs(grids), rewards.astype(np.float64), terminated, truncated, self._get_info(pathLengths)
+
+  def close_extras(self, **kwargs):
+    try:
+      self.socket.sendall(protocol.packMessage(protocol.MESSAGE_CLOSE))
+    except OSError:
+      # The server is already gone
+      pass
+    self.socket.close()
+
+  # =========================================================================================
+  # ================================ Private functions below ================================
+  # =========================================================================================
+
+  def _request(self, messageType, payload):
+    self.socket.sendall(protocol.packMessage(messageType, payload))
+    responseType, response = protocol.receiveMessage(self.socket)
+    if responseType == protocol.MESSAGE_ERROR:
+      raise RuntimeError(f'Env server error: {response.decode()}')
+    return response
+
+  def _unpackGrids(self, response):
+    gridCount = self.num_envs * self.gridSize[0] * self.gridSize[1]
+    grids = np.frombuffer(response, dtype=np.uint8, count=gridCount).reshape(self.num_envs, *self.gridSize)
+    return grids, gridCount
+
+  def _get_obs(self, grids):
+    return {
+      PatheryEnv.OBSERVATION_BOARD_STR: (grids[:, np.newaxis] == self.cellTypeValues).astype(np.float32)
+    }
+
+  def _get_info(self, pathLengths, mask=None):
+    if mask is None:
+      mask = np.ones(self.num_envs, dtype=bool)
+    return {
+      'Path length': np.where(mask, pathLengths, 0).astype(np.int32),
+      '_Path length': mask.copy()
+    }
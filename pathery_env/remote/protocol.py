@@ -0,0 +1,62 @@
+import struct
+
+# Binary protocol shared by the env server and client.
+#
+# Every message is a header followed by a payload. All integers are little-endian.
+#   Header: <payload length;uint32><message type;uint8>
+#
+# Client -> server:
+#   MAKE:  <env count;uint32><map string;utf-8, empty for random maps>
+#   RESET: <seeds;int64[env count], -1 for no seed><reset mask;uint8[env count]>
+#   STEP:  <actions;int32[env count][2]>
+#   CLOSE: (empty)
+# Server -> client:
+#   MAKE:  <env count;uint32><cell type count;uint32><height;uint32><width;uint32>
+#   RESET: <grids;uint8[env count][height][width]><path lengths;int32[env count]>
+#   STEP:  <grids;uint8[env count][height][width]><rewards;int32[env count]><terminated;uint8[env count]><truncated;uint8[env count]><path lengths;int32[env count]>
+#   ERROR: <message;utf-8>
+#
+# Messages with a payload longer than MAX_PAYLOAD_LENGTH are rejected.
+# A STEP, or a RESET which does not reset every env, is rejected until every env of the connection has been reset once.
+#
+# Boards are sent as their raw grid of cell values rather than the one-hot observation, which is over 4x smaller and is cheap for the client to expand.
+
+HEADER = struct.Struct('<IB')
+MAKE_REQUEST = struct.Struct('<I')
+MAKE_RESPONSE = struct.Struct('<IIII')
+
+MESSAGE_MAKE = 1
+MESSAGE_RESET = 2
+MESSAGE_STEP = 3
+MESSAGE_CLOSE = 4
+MESSAGE_ERROR = 255
+
+NO_SEED = -1
+MAX_PAYLOAD_LENGTH = 2**20
+
+def packMessage(messageType, payload=b''):
+  return HEADER.pack(len(payload), messageType) + payload
+
+async def readMessage(reader):
+  """Reads one message from an asyncio StreamReader. Returns (message type, payload)."""
+  payloadLength, messageType = HEADER.unpack(await reader.readexactly(HEADER.size))
+  if payloadLength > MAX_PAYLOAD_LENGTH:
+    raise ValueError(f'Message payload of {payloadLength} bytes is larger than the maximum of {MAX_PAYLOAD_LENGTH} bytes')
+  payload = await reader.readexactly(payloadLength)
+  return messageType, payload
+
+def receiveMessage(sock):
+  """Reads one message from a blocking socket. Returns (message type, payload)."""
+  payloadLength, messageType = HEADER.unpack(_receiveExactly(sock, HEADER.size))
+  return messageType, _receiveExactly(sock, payloadLength)
+
+def _receiveExactly(sock, byteCount):
+  buffer = bytearray(byteCount)
+  view = memoryview(buffer)
+  received = 0
+  while received < byteCount:
+    chunkSize = sock.recv_into(view[received:])
+    if chunkSize == 0:
+      raise ConnectionError('Connection closed by the env server')
+    received += chunkSize
+  return bytes(buffer)
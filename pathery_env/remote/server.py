@@ -0,0 +1,203 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import os
+import traceback
+
+import numpy as np
+
+from pathery_env.envs.pathery import PatheryEnv
+from pathery_env.remote import protocol
+
+class _EnvBatch:
+  """The boards owned by a single client connection."""
+
+  def __init__(self, envs):
+    self.envs = envs
+    # Like gymnasium's vector envs, an env which finished on the last step is reset on the next step
+    self.needsReset = np.zeros(len(envs), dtype=bool)
+    # Envs have no board until they are first reset, so every env must be reset at once before anything else
+    self.hasBeenReset = False
+
+class _Request:
+  """A reset or step request for every env of one _EnvBatch, along with its results."""
+
+  def __init__(self, envBatch, messageType, payload, future):
+    self.envBatch = envBatch
+    self.messageType = messageType
+    self.future = future
+    self.error = None
+    envCount = len(envBatch.envs)
+    self.pathLengths = np.empty(envCount, dtype=np.int32)
+    if messageType == protocol.MESSAGE_RESET:
+      if len(payload) != envCount*9:
+        raise ValueError(f'Expected a reset payload of {envCount*9} bytes, got {len(payload)}')
+      self.seeds = np.frombuffer(payload, dtype='<i8', count=envCount)
+      resetMask = np.frombuffer(payload, dtype=np.uint8, count=envCount, offset=envCount*8).astype(bool)
+      if not envBatch.hasBeenReset and not np.all(resetMask):
+        raise ValueError('Every env must be reset before only some of them can be reset')
+      self.envIndices = np.flatnonzero(resetMask)
+    else:
+      if not envBatch.hasBeenReset:
+        raise ValueError('Envs must be reset before they can be stepped')
+      if len(payload) != envCount*8:
+        raise ValueError(f'Expected a step payload of {envCount*8} bytes, got {len(payload)}')
+      self.actions = np.frombuffer(payload, dtype='<i4').reshape(envCount, 2)
+      self.rewards = np.zeros(envCount, dtype=np.int32)
+      self.terminated = np.zeros(envCount, dtype=np.uint8)
+      self.truncated = np.zeros(envCount, dtype=np.uint8)
+      self.envIndices = np.arange(envCount)
+
+class PatheryEnvServer:
+  """Hosts Pathery boards for remote clients over TCP or a Unix socket.
+
+  Each connection owns its own batch of boards. Step and reset requests which arrive while the server is busy are coalesced into one batch, and the envs of that batch are spread across a pool of threads. Calls into the C++ pathfinding library release the GIL, so pathfinding for different envs runs in parallel.
+    numThreads: Number of threads to step envs on. Defaults to the CPU count.
+    maxEnvCount: The most envs that a single connection may make.
+  """
+
+  def __init__(self, numThreads=None, maxEnvCount=1024):
+    self.requestQueue = None
+    self.numThreads = numThreads or os.cpu_count() or 1
+    self.maxEnvCount = maxEnvCount
+    # A connection only sends its next request after receiving the response to its previous one, so no env ever appears twice in a batch. This means that no two threads ever touch the same env at the same time.
+    self.executor = ThreadPoolExecutor(max_workers=self.numThreads)
+
+  async def serveTcp(self, host='127.0.0.1', port=0, ready=None):
+    """Serves forever on the given TCP address. If given, `ready` is called with the bound (host, port)."""
+    server = await asyncio.start_server(self._handleConnection, host, port)
+    await self._serve(server, ready, server.sockets[0].getsockname()[:2])
+
+  async def serveUnix(self, path, ready=None):
+    """Serves forever on the given Unix socket path. If given, `ready` is called with the path."""
+    server = await asyncio.start_unix_server(self._handleConnection, path)
+    await self._serve(server, ready, path)
+
+  # =========================================================================================
+  # ================================ Private functions below ================================
+  # =========================================================================================
+
+  async def _serve(self, server, ready, address):
+    self.requestQueue = asyncio.Queue()
+    batchTask = asyncio.create_task(self._processRequests())
+    batchTask.add_done_callback(_reportBatchTaskCrash)
+    if ready is not None:
+      ready(address)
+    try:
+      async with server:
+        await server.serve_forever()
+    finally:
+      batchTask.cancel()
+
+  async def _handleConnection(self, reader, writer):
+    loop = asyncio.get_running_loop()
+    envBatch = None
+    try:
+      while True:
+        messageType, payload = await protocol.readMessage(reader)
+        if messageType == protocol.MESSAGE_CLOSE:
+          break
+        try:
+          if messageType == protocol.MESSAGE_MAKE:
+            # Constructing envs is rare and only touches new envs, so it does not need to go through the batch queue
+            envBatch, response = await loop.run_in_executor(self.executor, _makeEnvs, payload, self.maxEnvCount)
+          elif messageType in (protocol.MESSAGE_RESET, protocol.MESSAGE_STEP):
+            if envBatch is None:
+              raise ValueError('Envs must be made before they can be reset or stepped')
+            request = _Request(envBatch, messageType, payload, loop.create_future())
+            await self.requestQueue.put(request)
+            response = await request.future
+          else:
+            raise ValueError(f'Unknown message type {messageType}')
+          writer.write(protocol.packMessage(messageType, response))
+        except Exception as e:
+          writer.write(protocol.packMessage(protocol.MESSAGE_ERROR, str(e).encode()))
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+      # Client disconnected
+      pass
+    except ValueError as e:
+      # The message could not be read, so we can no longer tell where the next one starts
+      writer.write(protocol.packMessage(protocol.MESSAGE_ERROR, str(e).encode()))
+    finally:
+      writer.close()
+
+  async def _processRequests(self):
+    loop = asyncio.get_running_loop()
+    while True:
+      # Wait for at least one request, then take everything else that has queued up while we were busy
+      requests = [await self.requestQueue.get()]
+      while not self.requestQueue.empty():
+        requests.append(self.requestQueue.get_nowait())
+
+      # Spread every env of every request evenly across the threads
+      work = [(request, envIndex) for request in requests for envIndex in request.envIndices]
+      chunks = [work[i::self.numThreads] for i in range(min(self.numThreads, len(work)))]
+      await asyncio.gather(*[loop.run_in_executor(self.executor, _runWork, chunk) for chunk in chunks])
+
+      for request in requests:
+        if request.future.cancelled():
+          continue
+        if request.error is not None:
+          request.future.set_exception(request.error)
+          continue
+        try:
+          response = _packResponse(request)
+        except Exception as e:
+          # Only fail this request, other requests in the batch are unaffected
+          request.future.set_exception(e)
+          continue
+        if request.messageType == protocol.MESSAGE_RESET:
+          request.envBatch.hasBeenReset = True
+        request.future.set_result(response)
+
+def _reportBatchTaskCrash(task):
+  # Nothing awaits the batch task, so without this a crash would go unnoticed and every client would hang
+  if task.cancelled() or task.exception() is None:
+    return
+  exception = task.exception()
+  print('Env server batch task crashed, no further requests will be served:')
+  traceback.print_exception(type(exception), exception, exception.__traceback__)
+
+def _makeEnvs(payload, maxEnvCount):
+  envCount, = protocol.MAKE_REQUEST.unpack_from(payload)
+  mapString = payload[protocol.MAKE_REQUEST.size:].decode()
+  if envCount == 0 or envCount > maxEnvCount:
+    raise ValueError(f'Env count must be between 1 and {maxEnvCount}, got {envCount}')
+  if mapString:
+    envs = [PatheryEnv.fromMapString(render_mode=None, map_string=mapString) for _ in range(envCount)]
+  else:
+    envs = [PatheryEnv.randomNormal(render_mode=None) for _ in range(envCount)]
+  env = envs[0]
+  return _EnvBatch(envs), protocol.MAKE_RESPONSE.pack(envCount, env.cellTypeCount, env.gridSize[0], env.gridSize[1])
+
+def _runWork(work):
+  """Resets or steps each (request, env index) pair. Runs on a worker thread."""
+  for request, i in work:
+    if request.error is not None:
+      continue
+    try:
+      env = request.envBatch.envs[i]
+      if request.messageType == protocol.MESSAGE_RESET:
+        seed = int(request.seeds[i])
+        _, info = env.reset(seed=(None if seed == protocol.NO_SEED else seed))
+        request.envBatch.needsReset[i] = False
+      elif request.envBatch.needsReset[i]:
+        _, info = env.reset()
+        request.envBatch.needsReset[i] = False
+      else:
+        _, request.rewards[i], request.terminated[i], request.truncated[i], info = env.step(request.actions[i])
+        request.envBatch.needsReset[i] = bool(request.terminated[i] or request.truncated[i])
+      request.pathLengths[i] = info['Path length']
+    except Exception as e:
+      request.error = e
+
+def _packResponse(request):
+  envs = request.envBatch.envs
+  grids = np.stack([env.grid for env in envs]).astype(np.uint8).tobytes()
+  if request.messageType == protocol.MESSAGE_RESET:
+    # Envs which were not reset still report their current path length
+    for i, env in enumerate(envs):
+      if i not in request.envIndices:
+        request.pathLengths[i] = len(env.currentPath)
+    return grids + request.pathLengths.tobytes()
+  return grids + request.rewards.tobytes() + request.terminated.tobytes() + request.truncated.tobytes() + request.pathLengths.tobytes()
@@ -0,0 +1,191 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from pathery_env.envs.pathery import CellType
+from pathery_env.envs.pathery import PatheryEnv
+
+# Wall-placement search for generating expert demonstrations.
+#
+# Two strategies are available, beam search and simulated annealing. Both only ever consider placing walls on cells of the current shortest path, since a wall anywhere else cannot change the path. Candidate wall sets are scored in batches with PatheryEnv.getShortestPathLengths (a single C++ call per batch, when the library is available) rather than by stepping an env per candidate.
+
+@dataclass
+class TrajectoryStep:
+  action: Tuple[int, int]
+  reward: int
+  pathLength: int
+
+@dataclass
+class SolverResult:
+  walls: List[Tuple[int, int]]
+  pathLength: int
+  submissionString: str
+  trajectory: Optional[List[TrajectoryStep]] = None
+
+@dataclass
+class _SearchState:
+  walls: List[Tuple[int, int]]
+  pathLength: int
+  wallSet: frozenset = field(init=False)
+
+  def __post_init__(self):
+    self.wallSet = frozenset(self.walls)
+
+def solve(map_string, method='beam', timeBudget=10.0, workerCount=None, seed=None, recordTrajectory=False, beamWidth=32, proposalCount=64, startTemperature=2.0):
+  """Searches for the longest path achievable on the given map by placing at most the map's wall count.
+
+  The search is run on `workerCount` processes (defaults to the CPU count) for roughly `timeBudget` seconds and the best wall set found by any worker is returned.
+    method: Either 'beam' or 'anneal'.
+    recordTrajectory: If True, also return the step-by-step trajectory of placing the walls in an env.
+    beamWidth: Number of wall sets kept per depth for beam search.
+    proposalCount: Number of moves scored per iteration for simulated annealing.
+    startTemperature: Initial temperature for simulated annealing. Linearly cools to 0 over the time budget.
+  """
+  if method not in ('beam', 'anneal'):
+    raise ValueError(f'Unknown search method "{method}"')
+  if workerCount is None:
+    workerCount = os.cpu_count() or 1
+  if seed is None:
+    seed = int(np.random.SeedSequence().entropy % (2**32))
+
+  searchArgs = [(map_string, method, workerIndex, workerCount, seed+workerIndex, timeBudget, beamWidth, proposalCount, startTemperature) for workerIndex in range(workerCount)]
+  if workerCount == 1:
+    results = [_runSearch(*searchArgs[0])]
+  else:
+    with ProcessPoolExecutor(max_workers=workerCount) as executor:
+      results = list(executor.map(_runSearch, *zip(*searchArgs)))
+
+  bestWalls, _ = max(results, key=lambda result: result[1])
+  return _buildResult(map_string, bestWalls, recordTrajectory)
+
+# =========================================================================================
+# ================================ Private functions below ================================
+# =========================================================================================
+
+def _runSearch(map_string, method, workerIndex, workerCount, seed, timeBudget, beamWidth, proposalCount, startTemperature):
+  """Entry point for a single worker. Returns the best (walls, pathLength) that this worker found."""
+  deadline = time.monotonic() + timeBudget
+  env = PatheryEnv.fromMapString(render_mode=None, map_string=map_string)
+  env.reset(seed=seed)
+  rng = np.random.default_rng(seed)
+  if method == 'beam':
+    best = _beamSearch(env, rng, deadline, beamWidth, workerIndex, workerCount)
+  else:
+    best = _simulatedAnnealing(env, rng, deadline, timeBudget, proposalCount, startTemperature)
+  return best.walls, best.pathLength
+
+def _gridWithWalls(baseGrid, walls):
+  grid = baseGrid.copy()
+  for row, col in walls:
+    grid[row][col] = CellType.WALL.value
+  return grid
+
+def _pathCandidates(baseGrid, path, wallSet):
+  """Returns the unique open cells of the path, in path order. These are the only cells where a new wall can change the path."""
+  candidates = []
+  seen = set()
+  for pos in path:
+    if pos in seen or pos in wallSet or baseGrid[pos[0]][pos[1]] != CellType.OPEN.value:
+      continue
+    seen.add(pos)
+    candidates.append(pos)
+  return candidates
+
+def _scoreWallSets(env, baseGrid, wallSets):
+  """Scores all wall sets with a single batched pathfinding call. Blocked paths score 0."""
+  grids = np.repeat(baseGrid[np.newaxis], len(wallSets), axis=0)
+  for i, walls in enumerate(wallSets):
+    for row, col in walls:
+      grids[i][row][col] = CellType.WALL.value
+  return env.getShortestPathLengths(grids)
+
+def _beamSearch(env, rng, deadline, beamWidth, workerIndex, workerCount):
+  baseGrid = env.grid.copy()
+  best = _SearchState([], len(env.currentPath))
+  beam = [best]
+  for depth in range(env.wallsToPlace):
+    if time.monotonic() >= deadline:
+      break
+    children = []
+    seen = set()
+    for state in beam:
+      path = env.getShortestPath(_gridWithWalls(baseGrid, state.walls))
+      candidates = _pathCandidates(baseGrid, path, state.wallSet)
+      if depth == 0:
+        # Split the first wall between workers so that they explore different parts of the search space
+        candidates = candidates[workerIndex::workerCount]
+      for candidate in candidates:
+        walls = state.walls + [candidate]
+        wallSet = state.wallSet | {candidate}
+        if wallSet in seen:
+          continue
+        seen.add(wallSet)
+        children.append(walls)
+    if not children:
+      break
+    pathLengths = _scoreWallSets(env, baseGrid, children)
+    # Randomly break ties so that equally scored children do not always favor the same part of the board
+    order = np.lexsort((rng.random(len(children)), -pathLengths))
+    beam = [_SearchState(children[i], int(pathLengths[i])) for i in order[:beamWidth] if pathLengths[i] > 0]
+    if not beam:
+      break
+    if beam[0].pathLength > best.pathLength:
+      best = beam[0]
+  return best
+
+def _simulatedAnnealing(env, rng, deadline, timeBudget, proposalCount, startTemperature):
+  baseGrid = env.grid.copy()
+  current = _SearchState([], len(env.currentPath))
+  best = current
+  while True:
+    timeLeft = deadline - time.monotonic()
+    if timeLeft <= 0:
+      break
+    temperature = startTemperature * timeLeft / timeBudget
+
+    path = env.getShortestPath(_gridWithWalls(baseGrid, current.walls))
+    candidates = _pathCandidates(baseGrid, path, current.wallSet)
+    proposals = []
+    for _ in range(proposalCount):
+      walls = list(current.walls)
+      if walls and (len(walls) == env.wallsToPlace or rng.random() < 0.5):
+        # Remove a wall, most of the time moving it somewhere else on the path
+        walls.pop(rng.integers(len(walls)))
+        if candidates and rng.random() < 0.8:
+          walls.append(candidates[rng.integers(len(candidates))])
+      elif candidates:
+        walls.append(candidates[rng.integers(len(candidates))])
+      proposals.append(walls)
+
+    pathLengths = _scoreWallSets(env, baseGrid, proposals)
+    bestProposalIndex = int(np.argmax(pathLengths))
+    proposalLength = int(pathLengths[bestProposalIndex])
+    if proposalLength == 0:
+      # Every proposal blocked the path
+      continue
+    delta = proposalLength - current.pathLength
+    if delta >= 0 or (temperature > 0 and rng.random() < math.exp(delta / temperature)):
+      current = _SearchState(proposals[bestProposalIndex], proposalLength)
+      if current.pathLength > best.pathLength:
+        best = current
+  return best
+
+def _buildResult(map_string, walls, recordTrajectory):
+  """Replays the walls in a fresh env to produce the submission string and, optionally, the trajectory."""
+  env = PatheryEnv.fromMapString(render_mode=None, map_string=map_string)
+  env.reset()
+  trajectory = []
+  for wall in walls:
+    _, reward, _, _, info = env.step(wall)
+    trajectory.append(TrajectoryStep(action=wall, reward=int(reward), pathLength=info['Path length']))
+  return SolverResult(
+    walls=list(walls),
+    pathLength=len(env.currentPath),
+    submissionString=env.getSubmissionString(),
+    trajectory=trajectory if recordTrajectory else None
+  )
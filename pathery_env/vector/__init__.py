@@ -0,0 +1 @@
+from pathery_env.vector.thread_pool_vector_env import ThreadPoolVectorEnv
\ No newline at end of file
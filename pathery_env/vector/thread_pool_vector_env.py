@@ -0,0 +1,114 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+import os
+
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import iterate
+
+class ThreadPoolVectorEnv(gym.vector.SyncVectorEnv):
+  """A vector env which steps its sub-envs concurrently on a pool of threads.
+
+  The C++ pathfinding library is called through ctypes, which releases the GIL for the duration of the call, so pathfinding for different envs can run in parallel. The rest of a step (building the observation and other bookkeeping) still holds the GIL, so the speedup depends on how much of the step time is spent pathfinding. Results are written straight into preallocated batch arrays.
+
+  Thread safety: Each sub-env is only ever touched by one thread at a time, so per-env state (the grid, the current path, and self.np_random) is never shared. The C++ pathfinder only reads the grid it is given and keeps all other state local to the call, so concurrent calls from different envs are safe. If the C++ library is not loaded, Python pathfinding is used; it is still correct, but holds the GIL and will not be faster than SyncVectorEnv.
+    num_threads: Number of threads to step sub-envs on. Defaults to the CPU count, capped at the number of envs.
+  Only the NEXT_STEP and DISABLED autoreset modes run concurrently; SAME_STEP falls back to stepping sequentially.
+  """
+
+  def __init__(self, env_fns, num_threads=None, **kwargs):
+    super().__init__(env_fns, **kwargs)
+    if num_threads is None:
+      num_threads = os.cpu_count() or 1
+    self.numThreads = max(1, min(num_threads, self.num_envs))
+    self.executor = ThreadPoolExecutor(max_workers=self.numThreads)
+    # Split envs into one contiguous chunk per thread, rather than submitting one task per env, to keep scheduling overhead low
+    self.envChunks = [chunk for chunk in np.array_split(np.arange(self.num_envs), self.numThreads) if len(chunk) > 0]
+    self.envInfos = [None] * self.num_envs
+
+  def reset(self, *, seed=None, options=None):
+    if options is not None and 'reset_mask' in options:
+      # Partial resets are rare, let the base class handle them sequentially
+      return super().reset(seed=seed, options=options)
+
+    if seed is None:
+      seed = [None for _ in range(self.num_envs)]
+    elif isinstance(seed, int):
+      seed = [seed + i for i in range(self.num_envs)]
+    if len(seed) != self.num_envs:
+      raise ValueError(f'If seeds are passed as a list the length must match num_envs={self.num_envs} but got length={len(seed)}.')
+
+    self._terminations[:] = False
+    self._truncations[:] = False
+    self._autoreset_envs[:] = False
+
+    def resetChunk(chunk):
+      for i in chunk:
+        observation, self.envInfos[i] = self.envs[i].reset(seed=seed[i], options=options)
+        self._writeObservation(i, observation)
+
+    self._runOnThreads(resetChunk)
+    infos = self._collectInfos()
+    return deepcopy(self._observations) if self.copy else self._observations, infos
+
+  def step(self, actions):
+    if self.autoreset_mode == AutoresetMode.SAME_STEP:
+      return super().step(actions)
+
+    actions = list(iterate(self.action_space, actions))
+
+    def stepChunk(chunk):
+      for i in chunk:
+        if self._autoreset_envs[i]:
+          if self.autoreset_mode == AutoresetMode.DISABLED:
+            raise RuntimeError(f'Env {i} must be reset before stepping when autoreset is disabled')
+          observation, self.envInfos[i] = self.envs[i].reset()
+          self._rewards[i] = 0.0
+          self._terminations[i] = False
+          self._truncations[i] = False
+        else:
+          observation, self._rewards[i], self._terminations[i], self._truncations[i], self.envInfos[i] = self.envs[i].step(actions[i])
+        self._writeObservation(i, observation)
+
+    self._runOnThreads(stepChunk)
+    infos = self._collectInfos()
+    self._autoreset_envs = np.logical_or(self._terminations, self._truncations)
+    return (
+      deepcopy(self._observations) if self.copy else self._observations,
+      np.copy(self._rewards),
+      np.copy(self._terminations),
+      np.copy(self._truncations),
+      infos
+    )
+
+  def close_extras(self, **kwargs):
+    self.executor.shutdown()
+    super().close_extras(**kwargs)
+
+  # =========================================================================================
+  # ================================ Private functions below ================================
+  # =========================================================================================
+
+  def _runOnThreads(self, function):
+    # Consume every result so that an exception raised in any thread is re-raised here
+    for _ in self.executor.map(function, self.envChunks):
+      pass
+
+  def _writeObservation(self, index, observation):
+    # SyncVectorEnv rebuilds the batch from _env_obs when it handles a partial reset or SAME_STEP autoreset, so it must stay up to date
+    self._env_obs[index] = observation
+    # Each env writes to its own row of the batch arrays, so threads never write to the same memory
+    if isinstance(self.single_observation_space, spaces.Dict):
+      for key, value in observation.items():
+        self._observations[key][index] = value
+    else:
+      self._observations[index] = observation
+
+  def _collectInfos(self):
+    # Merging infos touches shared dicts, so it is done on the calling thread once all envs are done
+    infos = {}
+    for i, info in enumerate(self.envInfos):
+      infos = self._add_info(infos, info, i)
+    return infos
@@ -1,4 +1,5 @@
 from pathery_env.wrappers.action_mask_observation import ActionMaskObservationWrapper
 from pathery_env.wrappers.flatten_action import FlattenActionWrapper
 from pathery_env.wrappers.flatten_board_observation import FlattenBoardObservationWrapper
+from pathery_env.wrappers.relevant_cell_action_mask import RelevantCellActionMaskWrapper
 from pathery_env.wrappers.undict_observation import UnDictObservationWrapper
\ No newline at end of file
@@ -0,0 +1,38 @@
+import numpy as np
+
+from pathery_env.envs.pathery import CellType
+from pathery_env.envs.pathery import PatheryEnv
+from pathery_env.wrappers.action_mask_observation import ActionMaskObservationWrapper
+
+class RelevantCellActionMaskWrapper(ActionMaskObservationWrapper):
+  """Like ActionMaskObservationWrapper, but only unmasks open cells which could ever be on a shortest path, as reported by PatheryEnv.getRelevantCells. Placing a wall in any other cell cannot change the path.
+
+  The relevant cells are cached between steps. A wall placed in an irrelevant cell keeps the cache, but any wall placed in a relevant cell (which is every wall chosen by a masked agent) recalculates the relevant cells for the whole board. This relies on the C++ library being built to stay cheap; the Python fallback is much slower.
+  If no open cell is relevant (for example, a start right next to a goal), the mask falls back to every open cell so that it is never all zeros while walls remain.
+  """
+
+  def __init__(self, env):
+    super().__init__(env)
+    self.relevantCells = None
+
+  def reset(self, **kwargs):
+    # Force the relevant cells to be recalculated for the new board
+    self.relevantCells = None
+    return super().reset(**kwargs)
+
+  def step(self, action):
+    # A wall placed in an irrelevant cell does not change which other cells are relevant. The mask will exclude this now-blocked cell on its own. Only recalculate if the wall was placed in a relevant cell.
+    if self.relevantCells is not None and self.relevantCells[action[0]][action[1]]:
+      self.relevantCells = None
+    return super().step(action)
+
+  def observation(self, observation):
+    if self.relevantCells is None:
+      self.relevantCells = self.unwrapped.getRelevantCells()
+    openMask = (observation[PatheryEnv.OBSERVATION_BOARD_STR][CellType.OPEN.value] == 1.0)
+    mask = openMask & self.relevantCells
+    if not mask.any():
+      # Masked samplers cannot handle an empty mask. No wall can change the path, so any open cell is as good as another.
+      mask = openMask
+    observation[ActionMaskObservationWrapper.OBSERVATION_ACTION_MASK_STR] = mask.astype(np.int8)
+    return observation
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+
+import argparse
+import asyncio
+from pathery_env.remote.server import PatheryEnvServer
+
+if __name__ == "__main__":
+  parser = argparse.ArgumentParser(description='Serve Pathery envs to remote clients')
+  parser.add_argument('--host', default='127.0.0.1')
+  parser.add_argument('--port', type=int, default=5555)
+  parser.add_argument('--unix-socket', help='Serve on this Unix socket path instead of TCP')
+  parser.add_argument('--threads', type=int, help='Number of threads to step envs on (default: CPU count)')
+  parser.add_argument('--max-envs', type=int, default=1024, help='Most envs that a single client may make')
+  args = parser.parse_args()
+
+  server = PatheryEnvServer(numThreads=args.threads, maxEnvCount=args.max_envs)
+  if args.unix_socket:
+    asyncio.run(server.serveUnix(args.unix_socket, ready=lambda address: print(f'Serving Pathery envs on {address}')))
+  else:
+    asyncio.run(server.serveTcp(args.host, args.port, ready=lambda address: print(f'Serving Pathery envs on {address[0]}:{address[1]}')))
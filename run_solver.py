@@ -0,0 +1,12 @@
+#!/usr/bin/env python
+
+from pathery_env.solver import solve
+
+mapString = '13.6.8.Simple...1727582400:,r3.11,f1.,r3.11,r3.,s1.11,r3.,r3.1,r1.2,r1.1,r1.4,r3.,r3.5,c1.5,r3.,r3.2,r1.8,r3.'
+
+if __name__ == "__main__":
+  for method in ['beam', 'anneal']:
+    result = solve(mapString, method=method, timeBudget=5.0, seed=12, recordTrajectory=True)
+    print(f'{method}: path length {result.pathLength}, submission "{result.submissionString}"')
+    for step in result.trajectory:
+      print(f'  Placed wall at {step.action}, reward: {step.reward}, path length: {step.pathLength}')
@@ -0,0 +1,100 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import pathery_env
+from pathery_env.envs.pathery import CellType
+from pathery_env.envs.pathery import PatheryEnv
+from pathery_env.wrappers import RelevantCellActionMaskWrapper
+
+sampleMapString = '13.6.8.Simple...1727582400:,r3.11,f1.,r3.11,r3.,s1.11,r3.,r3.1,r1.2,r1.1,r1.4,r3.,r3.5,c1.5,r3.,r3.2,r1.8,r3.'
+# Has checkpoints and a teleporter
+teleporterMapString = '17.9.13.Normal...:,r3.1,r1.1,r1.5,r1.3,c2.1,f1.,r3.1,c1.1,r1.,r1.3,r1.,r1.4,r1.,f1.,r3.15,f1.,r3.3,t1.2,u1.8,f1.,r3.4,r1.1,r1.8,f1.,s1.15,f1.,r3.5,r1.9,f1.,r3.10,r1.4,f1.,r3.15,f1.'
+# Has a checkpoint and ice
+iceMapString = '17.9.14.Normal...:,r3.,z5.2,r1.5,r1.,r1.4,f1.,r3.7,r1.7,f1.,r3.,c1.2,r1.1,r1.9,f1.,s1.3,r1.5,r1.3,r1.1,f1.,r3.9,r1.5,f1.,r3.12,r1.2,f1.,r3.15,f1.,r3.2,r1.4,r1.7,f1.,r3.1,z5.3,r1.9,f1.'
+
+def mapStringFromRows(rows, wallCount=3):
+  """Builds a map string from rows of characters. '.' is open, 'S' start, 'G' goal, 'R' rock, 'I' ice."""
+  cellCodes = {'S': 's1', 'G': 'f1', 'R': 'r1', 'I': 'z5'}
+  cells = []
+  openCount = 0
+  for char in ''.join(rows):
+    if char == '.':
+      openCount += 1
+    else:
+      cells.append(f'{openCount or ""},{cellCodes[char]}')
+      openCount = 0
+  return f'{len(rows[0])}.{len(rows)}.{wallCount}.Test...:' + '.'.join(cells) + '.'
+
+def makeEnv(mapString):
+  env = PatheryEnv.fromMapString(render_mode=None, map_string=mapString)
+  env.reset(seed=0)
+  return env
+
+def walledBoards(env, boardCount=20, seed=0):
+  """Yields the env with a different set of random walls placed on each iteration."""
+  rng = np.random.default_rng(seed)
+  originalGrid = env.grid.copy()
+  openCells = np.argwhere(originalGrid == CellType.OPEN.value)
+  for _ in range(boardCount):
+    env.grid = originalGrid.copy()
+    for row, col in openCells[rng.choice(len(openCells), size=rng.integers(0, 20), replace=False)]:
+      env.grid[row][col] = CellType.WALL.value
+    yield env
+  env.grid = originalGrid
+
+@pytest.mark.parametrize('mapString', [sampleMapString, teleporterMapString, iceMapString])
+def test_cppMatchesPython(mapString):
+  env = makeEnv(mapString)
+  if not env.hasCppRelevantCells:
+    pytest.skip('C++ pathfinding library is not built')
+  for board in walledBoards(env):
+    assert np.array_equal(board.getRelevantCells(), board._calculateRelevantCellsPython())
+
+@pytest.mark.parametrize('mapString', [sampleMapString, teleporterMapString, iceMapString])
+def test_irrelevantCellsDoNotChangePath(mapString):
+  env = makeEnv(mapString)
+  for board in walledBoards(env, boardCount=5):
+    pathLength = len(board._calculateShortestPath())
+    irrelevantOpenCells = np.argwhere((board.grid == CellType.OPEN.value) & ~board.getRelevantCells())
+    for row, col in irrelevantOpenCells:
+      board.grid[row][col] = CellType.WALL.value
+      assert len(board._calculateShortestPath()) == pathLength
+      board.grid[row][col] = CellType.OPEN.value
+
+def test_pocketIsIrrelevant():
+  env = makeEnv(mapStringFromRows(['S...G', 'R.RRR', 'RRRRR']))
+  assert not env.getRelevantCells()[1][1]
+  assert not env._calculateRelevantCellsPython()[1][1]
+
+def test_pocketNextToIceIsKept():
+  # A path sliding across the ice might be forced into the pocket below it
+  env = makeEnv(mapStringFromRows(['SI..G', 'R.RRR', 'RRRRR']))
+  assert env.getRelevantCells()[1][1]
+  assert env._calculateRelevantCellsPython()[1][1]
+
+@pytest.mark.parametrize('mapString', [sampleMapString, teleporterMapString, iceMapString])
+def test_cachedMaskMatchesFreshMask(mapString):
+  env = RelevantCellActionMaskWrapper(gym.make('pathery_env/Pathery-FromMapString', render_mode=None, map_string=mapString).unwrapped)
+  rng = np.random.default_rng(0)
+  observation, _ = env.reset(seed=0)
+  for stepIndex in range(env.unwrapped.wallsToPlace):
+    mask = observation['action_mask']
+    freshMask = (env.unwrapped.grid == CellType.OPEN.value) & env.unwrapped.getRelevantCells()
+    assert np.array_equal(mask, freshMask.astype(np.int8))
+    if stepIndex % 3 == 2:
+      # Sometimes wall an irrelevant open cell, which keeps the cached mask
+      candidates = np.argwhere((env.unwrapped.grid == CellType.OPEN.value) & (mask == 0))
+    else:
+      candidates = np.argwhere(mask == 1)
+    if len(candidates) == 0:
+      candidates = np.argwhere(mask == 1)
+    observation, _, terminated, _, _ = env.step(candidates[rng.integers(len(candidates))])
+    if terminated:
+      break
+
+def test_maskFallsBackToOpenCellsWhenNothingIsRelevant():
+  env = RelevantCellActionMaskWrapper(gym.make('pathery_env/Pathery-FromMapString', render_mode=None, map_string=mapStringFromRows(['SG...', 'RRRRR'])).unwrapped)
+  observation, _ = env.reset(seed=0)
+  assert not env.unwrapped.getRelevantCells()[0][2:].any()
+  assert np.array_equal(observation['action_mask'], (env.unwrapped.grid == CellType.OPEN.value).astype(np.int8))
@@ -0,0 +1,94 @@
+import asyncio
+import queue
+import socket
+import threading
+
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import pathery_env
+from pathery_env.remote import PatheryEnvClient, PatheryEnvServer
+from pathery_env.remote import protocol
+
+mapString = '13.6.8.Simple...1727582400:,r3.11,f1.,r3.11,r3.,s1.11,r3.,r3.1,r1.2,r1.1,r1.4,r3.,r3.5,c1.5,r3.,r3.2,r1.8,r3.'
+ENV_COUNT = 3
+
+@pytest.fixture(scope='module')
+def serverAddress(tmp_path_factory):
+  path = str(tmp_path_factory.mktemp('server') / 'pathery.sock')
+  ready = queue.Queue()
+  server = PatheryEnvServer(numThreads=2, maxEnvCount=8)
+  threading.Thread(target=lambda: asyncio.run(server.serveUnix(path, ready=ready.put)), daemon=True).start()
+  return ready.get(timeout=10)
+
+def makeLocalEnv():
+  return gym.make_vec('pathery_env/Pathery-FromMapString', num_envs=ENV_COUNT, vectorization_mode='sync', render_mode=None, map_string=mapString)
+
+def assertStepsMatch(remoteEnv, localEnv, stepCount, rng):
+  for _ in range(stepCount):
+    actions = np.stack([rng.integers(0, remoteEnv.gridSize[0], ENV_COUNT), rng.integers(0, remoteEnv.gridSize[1], ENV_COUNT)], axis=1)
+    remoteResult = remoteEnv.step(actions)
+    localResult = localEnv.step(actions)
+    assert np.array_equal(remoteResult[0]['board'], localResult[0]['board'])
+    for remoteValue, localValue in zip(remoteResult[1:4], localResult[1:4]):
+      assert np.array_equal(remoteValue, localValue)
+    assert np.array_equal(remoteResult[4]['Path length'], localResult[4]['Path length'])
+
+def test_matchesSyncVectorEnv(serverAddress):
+  remoteEnv = PatheryEnvClient(serverAddress, ENV_COUNT, map_string=mapString)
+  localEnv = makeLocalEnv()
+  remoteObservation, remoteInfo = remoteEnv.reset(seed=5)
+  localObservation, localInfo = localEnv.reset(seed=5)
+  assert np.array_equal(remoteObservation['board'], localObservation['board'])
+  assert np.array_equal(remoteInfo['Path length'], localInfo['Path length'])
+  rng = np.random.default_rng(0)
+  assertStepsMatch(remoteEnv, localEnv, 30, rng)
+
+  # Partial reset with per-env seeds
+  resetMask = np.array([True, False, True])
+  remoteObservation, remoteInfo = remoteEnv.reset(seed=[1, 2, 3], options={'reset_mask': resetMask})
+  localObservation, localInfo = localEnv.reset(seed=[1, 2, 3], options={'reset_mask': resetMask})
+  assert np.array_equal(remoteObservation['board'], localObservation['board'])
+  assert np.array_equal(remoteInfo['_Path length'], localInfo['_Path length'])
+  assert np.array_equal(remoteInfo['Path length'][resetMask], localInfo['Path length'][resetMask])
+  assertStepsMatch(remoteEnv, localEnv, 30, rng)
+  remoteEnv.close()
+  localEnv.close()
+
+def test_rejectsUnsupportedResetOptions(serverAddress):
+  remoteEnv = PatheryEnvClient(serverAddress, ENV_COUNT, map_string=mapString)
+  with pytest.raises(NotImplementedError):
+    remoteEnv.reset(options={'something': 1})
+  with pytest.raises(ValueError):
+    remoteEnv.reset(seed=[1, 2])
+  remoteEnv.close()
+
+def test_rejectsTooManyEnvs(serverAddress):
+  with pytest.raises(RuntimeError, match='Env count'):
+    PatheryEnvClient(serverAddress, 9, map_string=mapString)
+
+def test_survivesAbruptDisconnect(serverAddress):
+  sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+  sock.connect(serverAddress)
+  sock.sendall(protocol.HEADER.pack(100, protocol.MESSAGE_MAKE) + b'partial')
+  sock.close()
+  # The server should still serve new clients
+  remoteEnv = PatheryEnvClient(serverAddress, ENV_COUNT, map_string=mapString)
+  remoteEnv.reset(seed=0)
+  remoteEnv.close()
+
+def test_rejectsRequestsBeforeFullReset(serverAddress):
+  remoteEnv = PatheryEnvClient(serverAddress, ENV_COUNT, map_string=mapString)
+  with pytest.raises(RuntimeError, match='must be reset'):
+    remoteEnv.reset(seed=0, options={'reset_mask': np.array([True, False, True])})
+  with pytest.raises(RuntimeError, match='must be reset'):
+    remoteEnv.step(np.zeros((ENV_COUNT, 2), dtype=np.int32))
+  # Neither this connection nor any other is left hanging
+  otherEnv = PatheryEnvClient(serverAddress, ENV_COUNT, map_string=mapString)
+  otherEnv.reset(seed=0)
+  otherEnv.close()
+  remoteEnv.reset(seed=0)
+  remoteEnv.reset(seed=0, options={'reset_mask': np.array([True, False, True])})
+  remoteEnv.step(np.zeros((ENV_COUNT, 2), dtype=np.int32))
+  remoteEnv.close()
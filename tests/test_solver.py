@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from pathery_env.envs.pathery import CellType
+from pathery_env.envs.pathery import PatheryEnv
+from pathery_env.solver import _buildResult, solve
+
+mapString = '13.6.8.Simple...1727582400:,r3.11,f1.,r3.11,r3.,s1.11,r3.,r3.1,r1.2,r1.1,r1.4,r3.,r3.5,c1.5,r3.,r3.2,r1.8,r3.'
+# Walls which make a path of length 40 on the map above
+knownWalls = [(2, 6), (4, 4), (4, 8), (1, 1), (2, 2), (1, 5), (4, 9), (3, 10)]
+
+def makeEnv(useCpp):
+  env = PatheryEnv.fromMapString(render_mode=None, map_string=mapString)
+  if not useCpp:
+    env.pathfindingLibrary = None
+    env.hasCppShortestPathLengths = False
+  elif not env.hasCppShortestPathLengths:
+    pytest.skip('C++ pathfinding library is not built')
+  env.reset(seed=0)
+  return env
+
+def parseSubmissionString(submissionString):
+  return sorted(tuple(int(value) for value in pos.split(',')) for pos in submissionString.strip('.').split('.') if pos)
+
+@pytest.mark.parametrize('useCpp', [True, False])
+def test_shortestPathLengthsMatchPathfinding(useCpp):
+  env = makeEnv(useCpp)
+  rng = np.random.default_rng(0)
+  openCells = np.argwhere(env.grid == CellType.OPEN.value)
+  grids = np.repeat(env.grid[np.newaxis], 20, axis=0)
+  for grid in grids[1:]:
+    for row, col in openCells[rng.choice(len(openCells), size=rng.integers(1, 10), replace=False)]:
+      grid[row][col] = CellType.WALL.value
+  # Wall off the start, which blocks the path
+  grids[-1][2][1] = CellType.WALL.value
+
+  expectedLengths = []
+  originalGrid = env.grid
+  for grid in grids:
+    env.grid = grid.copy()
+    expectedLengths.append(len(env._calculateShortestPath()))
+  env.grid = originalGrid
+
+  pathLengths = env.getShortestPathLengths(grids)
+  assert pathLengths.tolist() == expectedLengths
+  assert pathLengths[-1] == 0
+  assert [len(env.getShortestPath(grid)) for grid in grids] == expectedLengths
+  # The env's own grid is left untouched
+  assert np.array_equal(env.grid, originalGrid)
+
+@pytest.mark.parametrize('method', ['beam', 'anneal'])
+def test_solveReturnsValidWalls(method):
+  result = solve(mapString, method=method, timeBudget=0.5, workerCount=1, seed=0, recordTrajectory=True)
+  env = PatheryEnv.fromMapString(render_mode=None, map_string=mapString)
+  env.reset()
+  initialPathLength = len(env.currentPath)
+
+  assert len(result.walls) <= env.wallsToPlace
+  assert len(set(result.walls)) == len(result.walls)
+  assert all(env.grid[row][col] == CellType.OPEN.value for row, col in result.walls)
+  assert result.pathLength >= initialPathLength
+  assert parseSubmissionString(result.submissionString) == sorted(result.walls)
+  assert initialPathLength + sum(step.reward for step in result.trajectory) == result.pathLength
+  assert result.trajectory[-1].pathLength == result.pathLength
+
+def test_buildResultForKnownWalls():
+  result = _buildResult(mapString, knownWalls, recordTrajectory=True)
+  assert result.pathLength == 40
+  assert result.submissionString == '.1,1.1,5.2,2.2,6.3,10.4,4.4,8.4,9.'
+  assert [step.action for step in result.trajectory] == knownWalls
+  assert 18 + sum(step.reward for step in result.trajectory) == 40
+
+  withoutTrajectory = _buildResult(mapString, knownWalls, recordTrajectory=False)
+  assert withoutTrajectory.trajectory is None
+  assert withoutTrajectory.submissionString == result.submissionString
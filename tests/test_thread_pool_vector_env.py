@@ -0,0 +1,50 @@
+import gymnasium as gym
+import numpy as np
+import pytest
+
+import pathery_env
+from pathery_env.vector import ThreadPoolVectorEnv
+
+mapString = '13.6.8.Simple...1727582400:,r3.11,f1.,r3.11,r3.,s1.11,r3.,r3.1,r1.2,r1.1,r1.4,r3.,r3.5,c1.5,r3.,r3.2,r1.8,r3.'
+ENV_COUNT = 5
+
+def makeEnvFns():
+  return [lambda: gym.make('pathery_env/Pathery-FromMapString', render_mode=None, map_string=mapString)] * ENV_COUNT
+
+def assertResultsMatch(threadedResult, syncResult):
+  assert np.array_equal(threadedResult[0]['board'], syncResult[0]['board'])
+  for threadedValue, syncValue in zip(threadedResult[1:-1], syncResult[1:-1]):
+    assert np.array_equal(threadedValue, syncValue)
+  threadedInfo, syncInfo = threadedResult[-1], syncResult[-1]
+  assert np.array_equal(threadedInfo['_Path length'], syncInfo['_Path length'])
+  mask = syncInfo['_Path length']
+  assert np.array_equal(threadedInfo['Path length'][mask], syncInfo['Path length'][mask])
+
+@pytest.mark.parametrize('numThreads', [1, 2, 8])
+def test_matchesSyncVectorEnv(numThreads):
+  threadedEnv = ThreadPoolVectorEnv(makeEnvFns(), num_threads=numThreads)
+  syncEnv = gym.vector.SyncVectorEnv(makeEnvFns())
+  assertResultsMatch(threadedEnv.reset(seed=3), syncEnv.reset(seed=3))
+
+  threadedEnv.action_space.seed(0)
+  for stepIndex in range(60):
+    actions = threadedEnv.action_space.sample()
+    assertResultsMatch(threadedEnv.step(actions), syncEnv.step(actions))
+    if stepIndex == 30:
+      # Partial reset in the middle of an episode
+      resetMask = np.array([True, False, True, False, False])
+      assertResultsMatch(threadedEnv.reset(seed=[7, 8, 9, 10, 11], options={'reset_mask': resetMask}), syncEnv.reset(seed=[7, 8, 9, 10, 11], options={'reset_mask': resetMask}))
+
+  threadedEnv.close()
+  syncEnv.close()
+
+def test_reraisesSubEnvErrors():
+  threadedEnv = ThreadPoolVectorEnv(makeEnvFns(), num_threads=2, autoreset_mode='Disabled')
+  threadedEnv.reset(seed=0)
+  # Walling the start position is invalid and terminates the episode
+  actions = np.tile(np.array([2, 0]), (ENV_COUNT, 1))
+  _, _, terminated, _, _ = threadedEnv.step(actions)
+  assert terminated.all()
+  with pytest.raises(RuntimeError, match='must be reset'):
+    threadedEnv.step(actions)
+  threadedEnv.close()